@@ -8,8 +8,74 @@ from scipy.stats import norm
 import math
 from random import sample as random_sample
 
+try:
+    from numba import njit, prange
+    numba_available = True
+except:
+    numba_available = False
+
 from .pd_utils import to_torch, join_to_df, argmax, complement, sample, torch_to_numpy
 
+# Domain size above which the compiled improvement kernels are used
+
+NUMBA_DOMAIN_N = 1000
+
+# Compiled improvement kernels
+
+if numba_available:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def expected_improvement_numba(mean, stdev, max_observed, jitter):
+        """Compiled EI kernel evaluated in parallel over domain points."""
+
+        ei = np.empty(len(mean))
+        for i in prange(len(mean)):
+            imp = mean[i] - max_observed - jitter
+            z = imp / stdev[i]
+            cdf = 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+            pdf = math.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+            if stdev[i] < jitter:
+                ei[i] = 0.0
+            else:
+                ei[i] = imp * cdf + stdev[i] * pdf
+
+        return ei
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def probability_of_improvement_numba(mean, stdev, max_observed, jitter):
+        """Compiled PI kernel evaluated in parallel over domain points."""
+
+        cdf = np.empty(len(mean))
+        for i in prange(len(mean)):
+            z = (mean[i] - max_observed - jitter) / stdev[i]
+            cdf[i] = 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+        return cdf
+
+# Kernel warm up
+
+warmed_kernels = False
+
+def warm_kernels():
+    """Compile the improvement kernels ahead of the first domain sweep.
+
+    Numba specializes a kernel for its argument types on first call. The
+    kernels are only ever dispatched on float64 arrays, so calling them
+    once on dummy inputs here moves the compilation (or load from the
+    on-disk cache) out of the first acquisition evaluation.
+
+    Returns
+    ----------
+    None
+    """
+
+    global warmed_kernels
+    if numba_available and not warmed_kernels:
+        dummy = np.ones(2, dtype='float64')
+        expected_improvement_numba(dummy, dummy, 0.0, 0.01)
+        probability_of_improvement_numba(dummy, dummy, 0.0, 0.01)
+        warmed_kernels = True
+
 # Main acquisition class
 
 class acquisition:
@@ -25,7 +91,7 @@ class acquisition:
         ----------
         function : str
             Acquisition function to be used. Options include: 'TS', 'EI', 'PI'
-            'UCB', 'EI-TS', 'PI-TS', 'UCB-TS', 'rand-TS', 'MeanMax-TS',
+            'UCB', 'qEI', 'EI-TS', 'PI-TS', 'UCB-TS', 'rand-TS', 'MeanMax-TS',
             'VarMax-TS', 'MeanMax', 'VarMax', 'rand', and 'eps-greedy'.
         batch_size : int
             Number of points to select.
@@ -34,6 +100,11 @@ class acquisition:
         
         """
         
+        # Compile the improvement kernels up front for functions which
+        # dispatch to them during domain sweeps
+        if function.lower() in ['ei', 'pi', 'ei-ts', 'pi-ts']:
+            warm_kernels()
+
         if function.lower() == 'ts':
             self.function = thompson_sampling(batch_size, duplicates)
         elif function.lower() == 'ei':
@@ -48,6 +119,8 @@ class acquisition:
             self.function = Kriging_believer(upper_confidence_bound, 
                                              batch_size, 
                                              duplicates)
+        elif function.lower() == 'qei':
+            self.function = q_expected_improvement(batch_size, duplicates)
         elif function.lower() == 'ei-ts':
             self.function = hybrid_TS('EI', batch_size, duplicates)
         elif function.lower() == 'pi-ts':
@@ -93,6 +166,36 @@ class acquisition:
         
         return self.function.run(model, obj)
     
+# Batched model moments
+
+def predict_mean_stdev(model, domain):
+    """Model mean and standard deviation over the domain.
+
+    Uses a single batched predict_mean_var call when the model provides
+    one so that both moments come from one forward pass. Falls back to
+    separate predict and variance calls for custom models.
+
+    Parameters
+    ----------
+    model : edbo.models
+        Trained model.
+    domain : torch.tensor
+        Domain points to be evaluated.
+
+    Returns
+    ----------
+    (numpy.array, numpy.array)
+        Model mean and standard deviation at each domain point.
+    """
+
+    try:
+        mean, var = model.predict_mean_var(domain)
+    except AttributeError:
+        mean = model.predict(domain)
+        var = model.variance(domain)
+
+    return np.array(mean), np.sqrt(var) + 1e-6
+
 # Thomposon Sampling
 
 class thompson_sampling:
@@ -137,7 +240,7 @@ class thompson_sampling:
         """
         
         # Draw samples from posterior
-        domain = to_torch(obj.domain, gpu=obj.gpu)
+        domain = obj.domain_tensor
         self.samples = sample(model, domain, self.batch_size, gpu=obj.gpu, chunk_size=self.chunk_size)
         #self.samples = model.sample_posterior(domain, self.batch_size)
         columns = list(obj.domain.columns.values) + ['sample']
@@ -196,7 +299,7 @@ class top_predicted:
             Selected domain points.
         """
         
-        domain = to_torch(obj.domain, gpu=obj.gpu)
+        domain = obj.domain_tensor
         pred = obj.domain.copy()
         pred['pred'] = model.predict(domain)
     
@@ -270,7 +373,7 @@ class max_variance:
             Selected domain points.
         """
         
-        domain = to_torch(obj.domain, gpu=obj.gpu)
+        domain = obj.domain_tensor
         var = obj.domain.copy()
         var['var'] = model.variance(domain)
     
@@ -332,7 +435,7 @@ def expected_improvement(model, obj, jitter=0.01):
     """
     
     # Domain
-    domain = to_torch(obj.domain, gpu=obj.gpu)
+    domain = obj.domain_tensor
     
     # Max obsereved objective value
     if len(obj.results) == 0:
@@ -341,17 +444,23 @@ def expected_improvement(model, obj, jitter=0.01):
         max_observed = obj.results.sort_values(obj.target).iloc[-1]
         max_observed = max_observed[obj.target]
     
-    # Mean and standard deviation
-    mean = model.predict(domain)
-    stdev = np.sqrt(model.variance(domain)) + 1e-6
-    
+    # Mean and standard deviation from a single batched call
+    mean, stdev = predict_mean_stdev(model, domain)
+
+    # Compiled kernel for large domains
+    if numba_available and len(mean) > NUMBA_DOMAIN_N:
+        return expected_improvement_numba(mean.astype('float64'),
+                                          stdev.astype('float64'),
+                                          float(max_observed),
+                                          jitter)
+
     # EI parameter values
     z = (mean - max_observed - jitter)/stdev
     imp = mean - max_observed - jitter
     ei = imp * norm.cdf(z) + stdev * norm.pdf(z)
-    
+
     ei[stdev < jitter] = 0.0
-    
+
     return ei
 
 # Probability of Improvement (PI)
@@ -378,7 +487,7 @@ def probability_of_improvement(model, obj, jitter=1e-2):
     """
     
     # Domain
-    domain = to_torch(obj.domain, gpu=obj.gpu)
+    domain = obj.domain_tensor
     
     # Max obsereved objective value
     if len(obj.results) == 0:
@@ -387,16 +496,22 @@ def probability_of_improvement(model, obj, jitter=1e-2):
         max_observed = obj.results.sort_values(obj.target).iloc[-1]
         max_observed = max_observed[obj.target]
     
-    # Mean and standard deviation
-    mean = model.predict(domain)
-    stdev = np.sqrt(model.variance(domain)) + 1e-6
-    
+    # Mean and standard deviation from a single batched call
+    mean, stdev = predict_mean_stdev(model, domain)
+
+    # Compiled kernel for large domains
+    if numba_available and len(mean) > NUMBA_DOMAIN_N:
+        return probability_of_improvement_numba(mean.astype('float64'),
+                                                stdev.astype('float64'),
+                                                float(max_observed),
+                                                jitter)
+
     # PI parameter values
     z = (mean - max_observed - jitter)/stdev
     cdf = norm.cdf(z)
-    
+
     cdf[stdev < jitter] == 0.0
-    
+
     return cdf
 
 # Upper Confidence Bound (UCB)
@@ -422,12 +537,11 @@ def upper_confidence_bound(model, obj, jitter=1e-2, delta=0.5):
     """
     
     # Domain
-    domain = to_torch(obj.domain, gpu=obj.gpu)
-    
-    # Mean and standard deviation
-    mean = model.predict(domain)
-    stdev = np.sqrt(model.variance(domain)) + 1e-6
+    domain = obj.domain_tensor
     
+    # Mean and standard deviation from a single batched call
+    mean, stdev = predict_mean_stdev(model, domain)
+
     # PI parameter values
     dim = len(obj.domain.columns.values)
     iters = len(obj.results)
@@ -435,6 +549,100 @@ def upper_confidence_bound(model, obj, jitter=1e-2, delta=0.5):
     
     return mean + beta * stdev
 
+# Joint batch selection via Monte Carlo q-Expected Improvement
+
+class q_expected_improvement:
+    """Class represents the Monte Carlo q-expected improvement algorithm.
+
+    Provides a framework for selecting a batch of experimental conditions
+    jointly by maximizing a Monte Carlo estimate of the joint expected
+    improvement over posterior samples. Unlike the Kriging believer
+    algorithm, no model refits are required between batch points.
+    """
+
+    def __init__(self, batch_size, duplicates, n_samples=100, chunk_size=20000):
+        """
+        Parameters
+        ----------
+        batch_size : int
+            Number of points to select.
+        duplicates : bool
+            Select duplicate domain points.
+        n_samples : int
+            Number of posterior samples used for the Monte Carlo estimate.
+        chunk_size : int
+            Sampling over large spaces can be very costly. If
+            len(domain) > chunk_size the space is broken up into chunks,
+            sampled, and concatenated together.
+
+        """
+
+        self.batch_size = batch_size
+        self.duplicates = duplicates
+        self.n_samples = n_samples
+        self.chunk_size = chunk_size
+
+    def run(self, model, obj):
+        """Run Monte Carlo q-EI on a trained model and user defined domain.
+
+        Batch points are chosen greedily: each round selects the domain
+        point with the largest marginal gain in the Monte Carlo estimate
+        of the joint expected improvement of the batch.
+
+        Parameters
+        ----------
+        model : edbo.models
+            Trained model to be sampled.
+        obj : edbo.objective
+            Objective object containing information about the domain.
+
+        Returns
+        ----------
+        pandas.DataFrame
+            Selected domain points.
+        """
+
+        # Max obsereved objective value
+        if len(obj.results) == 0:
+            max_observed = 0
+        else:
+            max_observed = obj.results.sort_values(obj.target).iloc[-1]
+            max_observed = max_observed[obj.target]
+
+        # Draw joint samples from the posterior
+        domain = obj.domain_tensor
+        samples = sample(model, domain, self.n_samples, gpu=obj.gpu,
+                         chunk_size=self.chunk_size)
+        samples = torch_to_numpy(samples, gpu=obj.gpu)
+
+        # Candidate mask for de-duplication against known results
+        if self.duplicates == False:
+            keep = np.array(complement(obj.domain,
+                                       obj.results.drop(obj.target, axis=1),
+                                       boolean_out=True))
+        else:
+            keep = np.ones(len(obj.domain), dtype=bool)
+
+        # Greedy maximization of the q-EI estimate. A duplicate batch
+        # point adds no joint improvement so selected points are always
+        # excluded from later rounds.
+        batch_max = np.full(len(samples), -np.inf)
+        selected = []
+        self.qei = []
+        for i in range(self.batch_size):
+            improvement = np.maximum(samples, batch_max[:,None]) - max_observed
+            improvement = improvement.clip(min=0.0).mean(axis=0)
+            improvement[~keep] = -np.inf
+            if len(selected) > 0:
+                improvement[selected] = -np.inf
+
+            choice = int(np.argmax(improvement))
+            selected.append(choice)
+            batch_max = np.maximum(batch_max, samples[:,choice])
+            self.qei.append(improvement)
+
+        return obj.domain.iloc[selected]
+
 # Batching via Kriging believer
 
 class Kriging_believer:
@@ -501,7 +709,7 @@ class Kriging_believer:
             
             # Log projections and model predictions
             self.projections.append(next_acq)
-            fant = model.predict(to_torch(obj.domain, gpu=obj.gpu))
+            fant = model.predict(obj.domain_tensor)
             self.projection_means.append(obj.scaler.unstandardize(fant))
             
             # De-duplication
@@ -680,7 +888,7 @@ class hybrid_TS:
         if self.batch_size > 1:
             
             # Draw samples from posterior
-            domain = to_torch(obj.domain, gpu=obj.gpu)
+            domain = obj.domain_tensor
             samples = model.sample_posterior(domain, self.batch_size - 1)
             columns = list(obj.domain.columns.values)
             columns.append('sample')
@@ -749,7 +957,7 @@ class eps_greedy:
         """
         
         # Get predictions
-        domain = to_torch(obj.domain, gpu=obj.gpu)
+        domain = obj.domain_tensor
         pred = obj.domain.copy()
         pred['pred'] = model.predict(domain)
         
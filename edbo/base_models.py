@@ -2,6 +2,8 @@
 
 # Imports
 
+from contextlib import ExitStack
+
 import torch
 import gpytorch
 from gpytorch.models import ExactGP
@@ -22,53 +24,60 @@ class gp_model(ExactGP):
     """
     
     def __init__(self, X, y, likelihood, gpu=False, nu=2.5,
-                 lengthscale_prior=None, outputscale_prior=None
+                 lengthscale_prior=None, outputscale_prior=None,
+                 batch_shape=torch.Size([])
                  ):
-        """        
+        """
         Parameters
         ----------
         X : torch.tensor
             Training domain values.
-        y : torch.tensor 
+        y : torch.tensor
             Training response values.
         likelihood : (gpytorch.likelihoods)
             Model likelihood.
-        gpu : bool 
-            Use GPUs (if available) to run gaussian process computations. 
-        nu : float 
+        gpu : bool
+            Use GPUs (if available) to run gaussian process computations.
+        nu : float
             Matern kernel parameter. Options: 0.5, 1.5, 2.5.
-        lengthscale_prior : [gpytorch.priors, init_value] 
-            GPyTorch prior object and initial value. Sets a prior over length 
+        lengthscale_prior : [gpytorch.priors, init_value]
+            GPyTorch prior object and initial value. Sets a prior over length
             scales.
-        outputscale_prior : [gpytorch.priors, init_value] 
+        outputscale_prior : [gpytorch.priors, init_value]
             GPyTorch prior object and initial value. Sets a prior over output s
             cales.
+        batch_shape : torch.Size
+            Batch dimensions for independent model copies. Used for training
+            random restarts in parallel.
         """
-        
+
         super(gp_model, self).__init__(X, y, likelihood)
-        
+
         # ARD
-        num_dims = len(X) if len(X) == 0 else len(X[0])
-        
+        num_dims = 0 if len(X) == 0 else X.shape[-1]
+
         # Base kernel
         if lengthscale_prior == None:
-            kernel = MaternKernel(nu=nu, 
-                               ard_num_dims=num_dims)
+            kernel = MaternKernel(nu=nu,
+                               ard_num_dims=num_dims,
+                               batch_shape=batch_shape)
         else:
-            kernel = MaternKernel(nu=nu, 
+            kernel = MaternKernel(nu=nu,
                                ard_num_dims=num_dims,
-                               lengthscale_prior=lengthscale_prior[0])
-        
+                               lengthscale_prior=lengthscale_prior[0],
+                               batch_shape=batch_shape)
+
         # Mean
-        self.mean_module = ConstantMean()
-        
+        self.mean_module = ConstantMean(batch_shape=batch_shape)
+
         # Output scale
         if outputscale_prior == None:
-            self.covar_module = ScaleKernel(kernel)
+            self.covar_module = ScaleKernel(kernel, batch_shape=batch_shape)
         else:
             self.covar_module = ScaleKernel(
                                 kernel,
-                                outputscale_prior=outputscale_prior[0])
+                                outputscale_prior=outputscale_prior[0],
+                                batch_shape=batch_shape)
         
         # Set initial values
         if lengthscale_prior != None:
@@ -164,12 +173,46 @@ def fast_computation(fastQ):
     """ 
     
     gpytorch.settings.fast_pred_var._state = fastQ
-    gpytorch.settings.fast_pred_samples._state = fastQ 
+    gpytorch.settings.fast_pred_samples._state = fastQ
     gpytorch.settings.fast_computations.covar_root_decomposition._state = fastQ
     gpytorch.settings.fast_computations.log_prob._state = fastQ
     gpytorch.settings.fast_computations.solves._state = fastQ
     gpytorch.settings.deterministic_probes._state = fastQ
     gpytorch.settings.memory_efficient._state = fastQ
+
+def fast_computation_settings(fastQ):
+    """Context manager form of the fast computation settings.
+
+    Scopes the settings modified by fast_computation to a with block
+    instead of mutating GPyTorch's global state, so optimizers with
+    different fast_comp values running in one process don't clobber
+    each other. Entered once around each training/acquisition pass
+    rather than toggled per iteration.
+
+    Parameters
+    ----------
+    fastQ : bool
+        If True, gpytorch fast computation features will be utilized
+        within the context.
+
+    Returns
+    ----------
+    contextlib.ExitStack
+        Context to enter around model training and prediction.
+    """
+
+    stack = ExitStack()
+    stack.enter_context(gpytorch.settings.fast_computations(
+            covar_root_decomposition=fastQ,
+            log_prob=fastQ,
+            solves=fastQ))
+    if fastQ:
+        stack.enter_context(gpytorch.settings.fast_pred_var())
+        stack.enter_context(gpytorch.settings.fast_pred_samples())
+        stack.enter_context(gpytorch.settings.deterministic_probes())
+        stack.enter_context(gpytorch.settings.memory_efficient())
+
+    return stack
     
     
     
@@ -10,7 +10,7 @@ import dill
 from gpytorch.priors import GammaPrior
 
 from .models import GP_Model
-from .base_models import fast_computation
+from .base_models import fast_computation_settings
 from .init_scheme import Init
 from .objective import objective
 from .acq_func import acquisition
@@ -78,7 +78,8 @@ class BO:
             Acquisition function used for for selecting a batch of domain 
             points to evaluate. Options: (TS) Thompson Sampling, ('EI') 
             Expected Improvement, (PI) Probability of Improvement, (UCB) 
-            Upper Confidence Bound, (EI-TS) EI (first choice) + TS (n-1 choices), 
+            Upper Confidence Bound, (qEI) Monte Carlo q-Expected 
+            Improvement, (EI-TS) EI (first choice) + TS (n-1 choices), 
             (PI-TS) PI (first choice) + TS (n-1 choices), (UCB-TS) UCB (first 
             choice) + TS (n-1 choices), (MeanMax-TS) Mean maximization 
             (first choice) + TS (n-1 choices), (VarMax-TS) Variance 
@@ -118,9 +119,8 @@ class BO:
             
         """
         
-        # Fast computation
+        # Fast computation settings entered around training and acquisition
         self.fast_comp = fast_comp
-        fast_computation(fast_comp)
         
         # Initialize data container
         self.obj = objective(results_path=results_path, 
@@ -144,6 +144,9 @@ class BO:
         # Initialize other stuff
         self.base_model = model # before eval for retraining
         self.model = model      # slot for after eval
+        # Resolved once here; avoids string-formatting the model class on
+        # every iteration of the optimization loop
+        self.exact_gp = isinstance(model, type) and issubclass(model, GP_Model)
         self.batch_size = batch_size
         self.duplicate_experiments = duplicate_experiments
         self.gpu = gpu
@@ -227,7 +230,8 @@ class BO:
                                      training_iters=training_iters
                                      )
         
-        self.model.fit()
+        with fast_computation_settings(self.fast_comp):
+            self.model.fit()
     
     # Run algorithm and get next round of experiments
     def run(self, append=False, n_restarts=0, learning_rate=0.1,
@@ -271,11 +275,17 @@ class BO:
                                      training_iters=training_iters
                                      )
         
-        self.model.fit()
-        
-        # Select candidate experiments via acquisition function
-        self.proposed_experiments = self.acq.evaluate(self.model, self.obj)
-        
+        with fast_computation_settings(self.fast_comp):
+
+            self.model.fit()
+
+            # Cache posterior quantities for repeated acquisition queries
+            if self.exact_gp:
+                self.model.posterior = self.model.build_posterior()
+
+            # Select candidate experiments via acquisition function
+            self.proposed_experiments = self.acq.evaluate(self.model, self.obj)
+
         # Append to know results
         if append == True:
             self.obj.get_results(self.proposed_experiments, append=append)
@@ -318,53 +328,129 @@ class BO:
         
         # Initialization data
         self.init_sample(seed=seed, append=True)
-        
+
         # Simulation
-        for i in range(iterations):
-                
-            # Use pamater estimates from previous step as initial values
-            if update_priors == True and i > 0 and 'GP' in str(self.base_model):
-                post_ls = self.model.model.covar_module.base_kernel.lengthscale.detach()[0]
-                post_os = self.model.model.covar_module.outputscale.detach()
-                post_n = self.model.model.likelihood.noise.detach()[0]
-                
-                if self.lengthscale_prior == None:
-                    self.lengthscale_prior = [None, post_ls]
-                else:
-                    self.lengthscale_prior[1] = post_ls
-                
-                if self.outputscale_prior == None:
-                    self.outputscale_prior = [None, post_os]
-                else:
-                    self.outputscale_prior[1] = post_os
-                    
-                if self.noise_prior == None:
-                    self.noise_prior = [None, post_n]
-                else:
-                    self.noise_prior[1] = post_n
-            
-            # Initialize and train model
-            self.model = self.base_model(self.obj.X, 
-                                     self.obj.y, 
-                                     gpu=self.gpu,
-                                     nu=self.nu,
-                                     noise_constraint=self.noise_constraint,
-                                     lengthscale_prior=self.lengthscale_prior,
-                                     outputscale_prior=self.outputscale_prior,
-                                     noise_prior=self.noise_prior,
-                                     n_restarts=n_restarts,
-                                     learning_rate=learning_rate,
-                                     training_iters=training_iters
-                                     )
+        lengthscale_prior = self.lengthscale_prior
+        outputscale_prior = self.outputscale_prior
+        noise_prior = self.noise_prior
+
+        # Enter the fast computation settings once for the whole loop
+        with fast_computation_settings(self.fast_comp):
+
+            for i in range(iterations):
+
+                # Warm start with detached copies of the parameter estimates
+                # from the previous step without mutating the specified priors
+                if update_priors == True and i > 0 and self.exact_gp:
+                    post_ls = self.model.model.covar_module.base_kernel.lengthscale.detach().clone()[0]
+                    post_os = self.model.model.covar_module.outputscale.detach().clone()
+                    post_n = self.model.model.likelihood.noise.detach().clone()[0]
+
+                    if self.lengthscale_prior == None:
+                        lengthscale_prior = [None, post_ls]
+                    else:
+                        lengthscale_prior = [self.lengthscale_prior[0], post_ls]
+
+                    if self.outputscale_prior == None:
+                        outputscale_prior = [None, post_os]
+                    else:
+                        outputscale_prior = [self.outputscale_prior[0], post_os]
+
+                    if self.noise_prior == None:
+                        noise_prior = [None, post_n]
+                    else:
+                        noise_prior = [self.noise_prior[0], post_n]
+
+                # Initialize and train model
+                self.model = self.base_model(self.obj.X,
+                                         self.obj.y,
+                                         gpu=self.gpu,
+                                         nu=self.nu,
+                                         noise_constraint=self.noise_constraint,
+                                         lengthscale_prior=lengthscale_prior,
+                                         outputscale_prior=outputscale_prior,
+                                         noise_prior=noise_prior,
+                                         n_restarts=n_restarts,
+                                         learning_rate=learning_rate,
+                                         training_iters=training_iters
+                                         )
             
-            self.model.fit()
-        
-            # Select candidate experiments via acquisition function
-            self.proposed_experiments = self.acq.evaluate(self.model, self.obj)
+                self.model.fit()
+
+                # Cache posterior quantities for repeated acquisition queries
+                if self.exact_gp:
+                    self.model.posterior = self.model.build_posterior()
+
+                # Select candidate experiments via acquisition function
+                self.proposed_experiments = self.acq.evaluate(self.model, self.obj)
             
-            # Append results to known data
-            self.obj.get_results(self.proposed_experiments, append=True)
-    
+                # Append results to known data
+                self.obj.get_results(self.proposed_experiments, append=True)
+
+    # Replicate simulations for benchmarking
+    def repeat(self, iterations=1, n_replicates=1, seeds=None,
+               update_priors=False, n_restarts=0, learning_rate=0.1,
+               training_iters=100):
+        """Run replicate simulations with different random seeds.
+
+        Benchmark statistics typically require many independent
+        optimization runs. Runs simulate once per seed, collecting the
+        observed objective values for each replicate. Results are cleared
+        between replicates.
+
+        Note
+        ----
+        Requires a computational objective or experiment index. The
+        returned table can be passed to edbo.plot_utils.plot_avg_convergence
+        via list(out.T.values). Results are cleared between replicates and
+        after the final one, so any results already loaded on the instance
+        are destroyed.
+
+        Parameters
+        ----------
+        iterations : int
+            Number of optimization iterations per replicate.
+        n_replicates : int
+            Number of replicate runs. Seeds default to range(n_replicates).
+        seeds : None, list
+            Random seeds used for initialization, one per replicate.
+            Overrides n_replicates.
+        update_priors : bool
+            Use parameter estimates from optimization step N-1 as initial
+            values for step N.
+        n_restarts : int
+            Number of restarts used when optimizing GPyTorch model parameters.
+        learning_rate : float
+            ADAM learning rate used when optimizing GPyTorch model parameters.
+        training_iters : int
+            Number of iterations to run ADAM when optimizing GPyTorch models
+            parameters.
+
+        Returns
+        ----------
+        pandas.DataFrame
+            Observed objective values with one column per replicate, in
+            order of observation.
+        """
+
+        if seeds == None:
+            seeds = list(range(n_replicates))
+
+        replicates = {}
+        for seed in seeds:
+            self.simulate(iterations=iterations,
+                          seed=seed,
+                          update_priors=update_priors,
+                          n_restarts=n_restarts,
+                          learning_rate=learning_rate,
+                          training_iters=training_iters)
+
+            observed = self.obj.results_input()[self.obj.target]
+            replicates['seed ' + str(seed)] = observed.reset_index(drop=True)
+            self.clear_results()
+
+        return pd.DataFrame(replicates)
+
     # Clear results between simulations
     def clear_results(self):
         """Clear results manually. 
@@ -407,25 +493,37 @@ class BO:
             Summary table.
         """
         
-        proposed_experiments = self.proposed_experiments.copy()
-        X = to_torch(proposed_experiments, gpu=self.gpu)
-        
-        # Compute mean and variance, then unstandardize
-        mean = self.obj.scaler.unstandardize(self.model.predict(X))
-        var = (np.sqrt(self.model.variance(X)) * self.obj.scaler.std)**2
-        
-        # Append to dataframe
-        for col, name in zip([mean, var], ['predicted ' + self.obj.target, 'variance']):
-            proposed_experiments[name] = col
-        
-        return proposed_experiments
+        X = to_torch(self.proposed_experiments, gpu=self.gpu)
+
+        # Compute mean and variance in a single pass, then unstandardize
+        pred, pred_var = self.model.predict_mean_var(X)
+        mean = self.obj.scaler.unstandardize(pred)
+        var = (np.sqrt(pred_var) * self.obj.scaler.std)**2
+
+        # Build the summary columns separately and join, avoiding a full
+        # copy of the proposed experiments
+        summary = pd.DataFrame(
+                {'predicted ' + self.obj.target: mean, 'variance': var},
+                index=self.proposed_experiments.index)
+
+        return pd.concat([self.proposed_experiments, summary], axis=1)
         
     # Best observed result
     def best(self):
         """Best observed objective values and corresponding domain point."""
-        
-        sort = self.obj.results_input().sort_values(self.obj.target, ascending=False)
-        return sort.head()
+
+        results = self.obj.results_input()
+        y = results[self.obj.target].to_numpy() if len(results) > 0 else np.array([])
+
+        # Partial selection of the top entries instead of a full sort
+        top_n = min(5, len(y))
+        if len(y) > top_n:
+            top = np.argpartition(y, -top_n)[-top_n:]
+        else:
+            top = np.arange(len(y))
+        top = top[np.argsort(-y[top])]
+
+        return results.iloc[top]
     
     # Save BO instance
     def save(self, path='BO.pkl'):
@@ -616,7 +714,8 @@ class BO_express(BO):
             Acquisition function used for for selecting a batch of domain 
             points to evaluate. Options: (TS) Thompson Sampling, ('EI') 
             Expected Improvement, (PI) Probability of Improvement, (UCB) 
-            Upper Confidence Bound, (EI-TS) EI (first choice) + TS (n-1 choices), 
+            Upper Confidence Bound, (qEI) Monte Carlo q-Expected 
+            Improvement, (EI-TS) EI (first choice) + TS (n-1 choices), 
             (PI-TS) PI (first choice) + TS (n-1 choices), (UCB-TS) UCB (first 
             choice) + TS (n-1 choices), (MeanMax-TS) Mean maximization 
             (first choice) + TS (n-1 choices), (VarMax-TS) Variance 
@@ -3,10 +3,14 @@
 # Imports
 
 import sys
+from contextlib import ExitStack
+
 import torch
+import gpytorch
 
 from gpytorch.likelihoods import GaussianLikelihood
 from gpytorch.constraints import GreaterThan
+from gpytorch.utils.cholesky import psd_safe_cholesky
 
 from sklearn.linear_model import ARDRegression
 from sklearn.model_selection import GridSearchCV
@@ -22,8 +26,129 @@ from .math_utils import model_performance
 from .pd_utils import to_torch
 from .opt_utils import optimize_mll
     
+# Training set size above which LOVE fast predictive variances are
+# enabled automatically durring prediction
+
+FAST_PRED_VAR_N = 500
+
+# Reduced precision inference
+
+def inference_precision(points):
+    """Context manager for reduced precision posterior queries.
+
+    Acquisition sweeps over large candidate domains are bandwidth bound on
+    GPUs. When points live on a GPU, posterior kernel evaluations are run
+    under bfloat16 autocasting, which halves memory traffic on tensor
+    cores. Training and the train-train Cholesky factorization are kept in
+    full precision; torch routes the triangular solves back to float32
+    automatically.
+
+    Parameters
+    ----------
+    points : torch.tensor
+        Domain points being evaluated.
+
+    Returns
+    ----------
+    contextlib.ExitStack
+        Context to enter around posterior kernel evaluations.
+    """
+
+    stack = ExitStack()
+    if torch.cuda.is_available() and points.is_cuda:
+        stack.enter_context(torch.autocast(device_type='cuda',
+                                           dtype=torch.bfloat16))
+
+    return stack
+
+# Cached gaussian process posterior
+
+class GP_Posterior:
+    """Cached posterior computations for a trained gaussian process model.
+
+    Stores the Cholesky factor of the training covariance matrix and the
+    corresponding weight vector after training. Repeated posterior queries
+    then only require test-train kernel evaluations rather than new
+    train-train solves.
+    """
+
+    def __init__(self, model, likelihood, X, y):
+        """
+        Parameters
+        ----------
+        model : edbo.base_models.gp_model
+            Trained GPyTorch model.
+        likelihood : gpytorch.likelihoods
+            Model likelihood.
+        X : torch.tensor
+            Training domain values.
+        y : torch.tensor
+            Training response values.
+
+        Note: the train-train factorization is always carried out in full
+        precision; only posterior queries run under reduced precision on
+        GPUs (see inference_precision).
+        """
+
+        self.model = model
+        self.X = X
+
+        # Precompute L = cholesky(K_XX + noise * I) and the weight vector
+        with torch.no_grad():
+            mean_X = model.mean_module(X)
+            K_XX = model.covar_module(X).evaluate()
+            noise = likelihood.noise
+            A = K_XX + noise * torch.eye(len(X),
+                                         dtype=K_XX.dtype,
+                                         device=K_XX.device)
+            self.L = psd_safe_cholesky(A)
+            self.alpha = torch.cholesky_solve((y - mean_X).unsqueeze(-1),
+                                              self.L)
+
+    # Posterior mean
+    def mean(self, points):
+        """Posterior predictive mean at points using cached factors."""
+
+        with torch.no_grad(), inference_precision(points):
+            K_xX = self.model.covar_module(points, self.X).evaluate()
+            pred = self.model.mean_module(points) + (K_xX @ self.alpha).squeeze(-1)
+
+        return pred.float()
+
+    # Posterior variance
+    def variance(self, points):
+        """Posterior predictive variance at points using cached factors."""
+
+        with torch.no_grad(), inference_precision(points):
+            K_xX = self.model.covar_module(points, self.X).evaluate()
+            K_xx = self.model.covar_module(points, diag=True)
+            solve = torch.linalg.solve_triangular(self.L,
+                                                  K_xX.t().float(),
+                                                  upper=False)
+            var = K_xx.float() - (solve ** 2).sum(0)
+
+        return var
+
+    # Posterior mean and variance from a single kernel evaluation
+    def mean_var(self, points):
+        """Posterior predictive mean and variance at points.
+
+        Both moments share a single test-train kernel evaluation.
+        """
+
+        with torch.no_grad(), inference_precision(points):
+            K_xX = self.model.covar_module(points, self.X).evaluate()
+            K_xx = self.model.covar_module(points, diag=True)
+            pred = self.model.mean_module(points) + (K_xX @ self.alpha).squeeze(-1)
+            solve = torch.linalg.solve_triangular(self.L,
+                                                  K_xX.t().float(),
+                                                  upper=False)
+            var = K_xx.float() - (solve ** 2).sum(0)
+
+        return pred.float(), var
+
 # Gaussian Process Model
-        
+
 class GP_Model:
     """Main gaussian process model used for Bayesian optimization.
     
@@ -89,7 +214,9 @@ class GP_Model:
         self.lengthscale_prior = lengthscale_prior
         self.outputscale_prior = outputscale_prior
         self.noise_prior = noise_prior
-        
+        self.posterior = None
+        self.moments_cache = None
+
         # Configure likelihood
         self.likelihood = GaussianLikelihood()
         if noise_prior != None:
@@ -134,14 +261,63 @@ class GP_Model:
     
     # Fit model
     def fit(self):
-        """Train the gaussian process model.""" 
-        
+        """Train the gaussian process model."""
+
         if self.inference_type == 'MLE':
             self.mle()
         else:
             print('Please specify valid inference type.')
-            sys.exit(0)    
-        
+            sys.exit(0)
+
+        # Invalidate caches built for previous hyperparameters
+        self.posterior = None
+        self.moments_cache = None
+
+    # Precompute posterior quantities
+    def build_posterior(self):
+        """Precompute posterior quantities for repeated prediction.
+
+        Caches the Cholesky factor of the training covariance matrix and
+        the corresponding weight vector. Once assigned to self.posterior,
+        predict and variance reuse the cached factors instead of running
+        new train-train solves for every query.
+
+        Returns
+        ----------
+        edbo.models.GP_Posterior
+            Cached posterior computations.
+        """
+
+        # Get into evaluation mode
+        self.model.eval()
+        self.likelihood.eval()
+
+        return GP_Posterior(self.model, self.likelihood, self.X, self.y)
+
+    # Prediction settings
+    def prediction_settings(self):
+        """Context manager for posterior prediction settings.
+
+        Enables GPyTorch's LOVE fast predictive variances and samples
+        when the training set is large enough for the exact covariance
+        solves to dominate prediction time. On GPUs, posterior queries
+        additionally run under reduced precision (see inference_precision).
+
+        Returns
+        ----------
+        contextlib.ExitStack
+            Context to enter around posterior queries.
+        """
+
+        stack = ExitStack()
+        if len(self.X) > FAST_PRED_VAR_N:
+            stack.enter_context(gpytorch.settings.fast_pred_var())
+            stack.enter_context(gpytorch.settings.fast_pred_samples())
+        if self.gpu == True:
+            stack.enter_context(inference_precision(self.X))
+
+        return stack
+
     # Mean of predictive posterior
     def predict(self, points):
         """Mean of gaussian process posterior predictive distribution.
@@ -163,14 +339,20 @@ class GP_Model:
         
         # Make predictions
         points = to_torch(points, gpu=self.gpu)
-        
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            pred = self.model(points).mean.detach()
-            
+
+        if self.moments_cache != None and self.moments_cache[0] is points:
+            pred = self.moments_cache[1]
+        elif self.posterior != None:
+            pred = self.posterior.mean(points)
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                with self.prediction_settings():
+                    pred = self.model(points).mean.detach()
+
         if torch.cuda.is_available() and self.gpu == True:
-            pred = pred.cpu()
-        
+            pred = pred.float().cpu()
+
         return pred.numpy()
     
     # GP prediction variance
@@ -194,13 +376,69 @@ class GP_Model:
         
         # Compuate variance
         points = to_torch(points, gpu=self.gpu)
-        var = self.model(points).variance.detach()
-        
+
+        if self.moments_cache != None and self.moments_cache[0] is points:
+            var = self.moments_cache[2]
+        elif self.posterior != None:
+            var = self.posterior.variance(points)
+        else:
+            with self.prediction_settings():
+                var = self.model(points).variance.detach()
+
         if torch.cuda.is_available() and self.gpu == True:
-            var = var.cpu()
-        
+            var = var.float().cpu()
+
         return var.numpy()
     
+    # Mean and variance of predictive posterior
+    def predict_mean_var(self, points):
+        """Mean and variance of gaussian process posterior predictive distribution.
+
+        Both moments are evaluated from a single forward pass so the
+        posterior covariance factors are only computed once per batch of
+        points.
+
+        Parameters
+        ----------
+        points : torch.tensor
+            Domain points to be evaluated.
+
+        Returns
+        ----------
+        (numpy.array, numpy.array)
+            Predicted response values and model variance at points.
+        """
+
+        # Get into evaluation mode
+        self.model.eval()
+        self.likelihood.eval()
+
+        # Make predictions
+        points = to_torch(points, gpu=self.gpu)
+
+        if self.moments_cache != None and self.moments_cache[0] is points:
+            return self.moments_cache[1].numpy(), self.moments_cache[2].numpy()
+
+        if self.posterior != None:
+            pred, var = self.posterior.mean_var(points)
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                with torch.no_grad(), self.prediction_settings():
+                    posterior = self.model(points)
+                    pred = posterior.mean.detach()
+                    var = posterior.variance.detach()
+
+        if torch.cuda.is_available() and self.gpu == True:
+            pred = pred.float().cpu()
+            var = var.float().cpu()
+
+        # Follow-up single-moment queries on the same tensor reuse these
+        # moments rather than re-running the forward pass
+        self.moments_cache = (points, pred, var)
+
+        return pred.numpy(), var.numpy()
+
     # Sample posterior
     def sample_posterior(self, points, batch_size=1):
         """Sample functions from gaussian process posterior predictive distribution.
@@ -225,8 +463,9 @@ class GP_Model:
         self.likelihood.eval()
         
         # Sample the posterior
-        posterior = self.model(points)
-        samples = posterior.sample(torch.Size([batch_size]))
+        with self.prediction_settings():
+            posterior = self.model(points)
+            samples = posterior.sample(torch.Size([batch_size]))
         
         return samples
     
@@ -410,9 +649,39 @@ class RF_Model:
         
         return to_torch(samples)
     
+    # Mean and variance of the ensemble
+    def predict_mean_var(self, points):
+        """Mean and variance of random forest ensemble.
+
+        Both moments are estimated from a single pass over the individual
+        tree predictions.
+
+        Parameters
+        ----------
+        points : numpy.array
+            Domain points to be evaluated.
+
+        Returns
+        ----------
+        (numpy.array, numpy.array)
+            Predicted response values and ensemble variance at points.
+        """
+
+        # Make sure points in a numpy array
+        points = np.array(points)
+
+        n_estimators = self.model.n_estimators
+
+        samples = []
+        for tree in range(n_estimators):
+            tree_estimates = self.model.estimators_[tree].predict(points)
+            samples.append(tree_estimates)
+
+        return np.mean(samples, axis=0), np.var(samples, axis=0)
+
     # Estimate variance from trees in the forest
     def variance(self, points):
-        """Variance of random forest ensemble. 
+        """Variance of random forest ensemble.
         
         Model variance is estimated as the vairance in the individual tree 
         predictions.
@@ -587,9 +856,34 @@ class Bayesian_Linear_Model:
         
         # Make predicitons
         pred, std = self.model.predict(points, return_std=True)
-        
+
         return std**2
 
+    # Mean and variance in a single call
+    def predict_mean_var(self, points):
+        """Mean and estimated variance of Bayesian linear model.
+
+        Both moments are computed in a single call to the underlying model.
+
+        Parameters
+        ----------
+        points : numpy.array
+            Domain points to be evaluated.
+
+        Returns
+        ----------
+        (numpy.array, numpy.array)
+            Predicted response values and model variance at points.
+        """
+
+        # Make sure points in a numpy array
+        points = np.array(points)
+
+        # Make predicitons
+        pred, std = self.model.predict(points, return_std=True)
+
+        return pred, std**2
+
 # Random sample
         
 class Random:
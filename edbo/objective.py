@@ -72,9 +72,9 @@ class objective:
         
         if domain_path != None:
             self.domain = load_csv_or_excel(self.domain_path)
-        
+
         self.domain.reset_index(drop=True)
-        
+
         # Load results
         
         if type(self.results) == type(pd.DataFrame()) and len(self.results) > 0:
@@ -115,7 +115,21 @@ class objective:
         else:
             self.X = to_torch([], gpu=gpu)
             self.y = to_torch([], gpu=gpu)
-        
+
+    # Torch representation of the domain
+
+    @property
+    def domain_tensor(self):
+        """Torch tensor of the current domain.
+
+        Derived from self.domain on access so encoders which replace the
+        domain after initialization stay consistent. Repeated conversions
+        of the same frame are memoized by to_torch, so acquisition
+        evaluations share a single conversion.
+        """
+
+        return to_torch(self.domain, gpu=self.gpu)
+
     # Get results from the index
     
     def get_results(self, domain_points, append=False):
@@ -2,13 +2,16 @@
 
 # Imports
 
-import numpy as np
 import torch
 import gpytorch
 from gpytorch.priors import GammaPrior
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.constraints import GreaterThan
 
 from copy import deepcopy
 
+from .base_models import gp_model
+
 # Disctionary of distributions for randomm initialization
 
 def build_dist_dict(noise_prior, outputscale_prior, lengthscale_prior):
@@ -66,49 +69,141 @@ def set_init_params(dictionary, distributions, seed=0):
 
 # Optimize a model via MLE
 
-def optimize_mll(model, likelihood, X, y, learning_rate=0.1, 
+def optimize_mll(model, likelihood, X, y, learning_rate=0.1,
                  n_restarts=0, training_iters=100, noise_prior=None,
                  outputscale_prior=None, lengthscale_prior=None):
-    
+
+    # Run all restarts in lock-step as a single batched model
+    if n_restarts > 0:
+        return optimize_mll_batched(model, likelihood, X, y,
+                                    learning_rate=learning_rate,
+                                    n_restarts=n_restarts,
+                                    training_iters=training_iters,
+                                    noise_prior=noise_prior,
+                                    outputscale_prior=outputscale_prior,
+                                    lengthscale_prior=lengthscale_prior)
+
     # Model and likelihood in training mode
     model.train()
     likelihood.train()
-    
+
     # Use ADAM
     optimizer = torch.optim.Adam(
                 [{'params': model.parameters()}, ],
                 lr=learning_rate
                 )
-    # Marginal log likelihood loss                          
+    # Marginal log likelihood loss
     mll = gpytorch.mlls.ExactMarginalLogLikelihood(likelihood, model)
-    
-    # Dictionary of distributions to draw random restarts from
+
+    # Optimization
+    step_losses = []
+    for i in range(training_iters):
+        optimizer.zero_grad()
+        output = model(X)
+        loss = -mll(output, y)
+        step_losses.append(loss.item())
+        loss.backward()
+        optimizer.step()
+
+    return [step_losses]
+
+# Optimize random restarts in parallel via a batched model
+
+def optimize_mll_batched(model, likelihood, X, y, learning_rate=0.1,
+                         n_restarts=0, training_iters=100, noise_prior=None,
+                         outputscale_prior=None, lengthscale_prior=None):
+    """
+    Optimize all random restarts in lock-step. Restart starting points are
+    stacked into a batched copy of the model so every ADAM step advances
+    every restart through a single batched kernel evaluation. The best
+    restart's parameters are loaded back into the original model.
+    """
+
+    n_batch = n_restarts + 1
+    batch_shape = torch.Size([n_batch])
+
+    # Replicate training data across the batch dimension
+    X_batch = X.unsqueeze(0).expand(n_batch, *X.shape)
+    y_batch = y.unsqueeze(0).expand(n_batch, *y.shape)
+
+    # Batched likelihood mirroring the model's noise configuration
+    if noise_prior != None:
+        batch_likelihood = GaussianLikelihood(batch_shape=batch_shape,
+                                              noise_prior=noise_prior[0])
+    else:
+        batch_likelihood = GaussianLikelihood(batch_shape=batch_shape)
+
+    batch_likelihood.noise_covar.register_constraint(
+            'raw_noise',
+            GreaterThan(likelihood.noise_covar.raw_noise_constraint.lower_bound))
+
+    # Batched copy of the model
+    batch_model = gp_model(X_batch,
+                           y_batch,
+                           batch_likelihood,
+                           nu=model.covar_module.base_kernel.nu,
+                           lengthscale_prior=lengthscale_prior,
+                           outputscale_prior=outputscale_prior,
+                           batch_shape=batch_shape)
+
+    if X.is_cuda:
+        batch_model = batch_model.cuda()
+
+    # First restart keeps the specified initial values, the rest draw
+    # starting points from the restart distributions
     dist_dict = build_dist_dict(noise_prior, outputscale_prior, lengthscale_prior)
-    
-    # Restart optimizer with random inits drawn from priors
-    states = []
-    loss_list = []
-    min_loss_list = []
-    for restart in range(n_restarts + 1):
-        
-        step_losses = []
-        # Optimization
-        for i in range(training_iters):
-            optimizer.zero_grad()
-            output = model(X)
-            loss = -mll(output, y)
-            step_losses.append(loss.item())
-            loss.backward()
-            optimizer.step()
-
-        states.append(deepcopy(mll.model.state_dict()))
-        loss_list.append(step_losses)
-        min_loss_list.append(loss.item())
-    
-        new_state = set_init_params(states[0], dist_dict, seed=restart)
-        mll.model.load_state_dict(new_state)
 
-    # Set to best state
-    mll.model.load_state_dict(states[np.argmin(min_loss_list)])
-    
-    return loss_list
\ No newline at end of file
+    state = deepcopy(batch_model.state_dict())
+    init_state = model.state_dict()
+
+    for key in dist_dict:
+        params = state[key]
+        torch.manual_seed(0)
+        state[key] = dist_dict[key].expand(params.shape).sample().log()
+
+    for key in state:
+        if key in init_state and state[key].shape[1:] == init_state[key].shape \
+        and state[key].dim() == init_state[key].dim() + 1:
+            state[key][0] = init_state[key]
+
+    batch_model.load_state_dict(state)
+
+    # Model and likelihood in training mode
+    batch_model.train()
+    batch_likelihood.train()
+
+    # Use ADAM
+    optimizer = torch.optim.Adam(
+                [{'params': batch_model.parameters()}, ],
+                lr=learning_rate
+                )
+    # Marginal log likelihood loss
+    mll = gpytorch.mlls.ExactMarginalLogLikelihood(batch_likelihood, batch_model)
+
+    # Optimization
+    step_losses = []
+    for i in range(training_iters):
+        optimizer.zero_grad()
+        output = batch_model(X_batch)
+        loss = -mll(output, y_batch)
+        step_losses.append(loss.detach())
+        loss.sum().backward()
+        optimizer.step()
+
+    # Load the best restart's parameters into the original model
+    if len(step_losses) > 0:
+        best = int(torch.argmin(step_losses[-1]))
+    else:
+        best = 0
+
+    best_state = deepcopy(init_state)
+    batch_state = batch_model.state_dict()
+    for key in best_state:
+        if key in batch_state and batch_state[key].shape[1:] == best_state[key].shape \
+        and batch_state[key].dim() == best_state[key].dim() + 1:
+            best_state[key] = batch_state[key][best].detach().clone()
+
+    model.load_state_dict(best_state)
+
+    return [[float(step[restart]) for step in step_losses]
+            for restart in range(n_batch)]
\ No newline at end of file
@@ -5,6 +5,7 @@
 import pandas as pd
 import torch
 import numpy as np
+import weakref
 from os import listdir
 from os.path import isdir, isfile
 
@@ -74,14 +75,27 @@ def write_experiment_results(data,experiment_results_path):
     
 # Convert to torch tensors
 
+# Memo of DataFrame conversions keyed on object identity. Conversions are
+# repeated on the same immutable frames (e.g. the domain) throughout a BO
+# run; entries are dropped when the source DataFrame is garbage collected.
+
+tensor_cache = {}
+
 def to_torch(data, gpu=False):
     """
     Convert from pandas dataframe or numpy array to torch array.
     """
-    
+
+    if type(data) == pd.DataFrame:
+        key = (id(data), gpu)
+        if key in tensor_cache:
+            return tensor_cache[key]
+    else:
+        key = None
+
     if 'torch' in str(type(data)):
         torch_data = data
-    
+
     else:
         try:
             torch_data = torch.from_numpy(np.array(data).astype('float')).float()
@@ -89,8 +103,15 @@ def to_torch(data, gpu=False):
             torch_data = torch.tensor(data).float()
 
     if torch.cuda.is_available() and gpu == True:
-        torch_data = torch_data.cuda()
-    
+        # Stage through pinned memory so the host-device copy is a single
+        # DMA transfer and can overlap with compute
+        if not torch_data.is_cuda:
+            torch_data = torch_data.pin_memory().cuda(non_blocking=True)
+
+    if key != None:
+        tensor_cache[key] = torch_data
+        weakref.finalize(data, tensor_cache.pop, key, None)
+
     return torch_data
 
 def torch_to_numpy(data, gpu=False):
@@ -147,25 +168,28 @@ def torch_to_numpy(data, gpu=False):
 def complement(df1, df2, rounding=False, boolean_out=False):
     """
     Complement of two dataframes. Remove elements of df2 in df1.
-    Retains indices of df1.
+    Retains indices of df1. Membership is tested on row hashes so the
+    frames are never concatenated or copied.
     """
-    
-    df1 = df1.copy()
-    df2 = df2.copy().reset_index(drop=True)
-    
+
     if rounding != False:
         df1 = df1.round(decimals=rounding)
         df2 = df2.round(decimals=rounding)
-    
-    df1_comp_df2 = pd.concat([df1, df2]).drop_duplicates(keep=False)
-       
+
+    try:
+        # Align column order and dtypes so equal rows hash equal
+        df2 = df2.reindex(columns=df1.columns).astype(df1.dtypes.to_dict())
+        hash1 = pd.util.hash_pandas_object(df1, index=False).to_numpy()
+        hash2 = pd.util.hash_pandas_object(df2, index=False).to_numpy()
+        boolean = ~np.isin(hash1, hash2)
+    except:
+        df1_comp_df2 = pd.concat([df1, df2]).drop_duplicates(keep=False)
+        boolean = np.isin(df1.index.values, df1_comp_df2.index.values)
+
     if boolean_out == True:
-        index1 = df1.index.values
-        indexc = df1_comp_df2.index.values
-        boolean = list(np.isin(index1, indexc))
-        return boolean
+        return list(boolean)
     else:
-        return df1_comp_df2
+        return df1[boolean]
 
 # Sampling
 
@@ -29,13 +29,16 @@ def f(x):
 
 # Test a precomputed objective
 
-def BO_pred(acq_func, plot=False, return_='pred', append=False, init='external', fast_comp=True):
-    
+def BO_pred(acq_func, plot=False, return_='pred', append=False, init='external', fast_comp=True, batch_size=None):
+
     # Experiment index
     X = np.linspace(0,1,1000)
     exindex = pd.DataFrame([[x, f(x)] for x in X], columns=['x', 'f(x)'])
     training_points = [50, 300, 500, 900]
-    
+
+    if batch_size == None:
+        batch_size = random.sample([1,2,3,4,5,6,7,8,9,10],1)[0]
+
     # Instatiate BO class
     bo = BO(exindex=exindex,
             domain=exindex.drop('f(x)', axis=1),
@@ -44,7 +47,7 @@ def BO_pred(acq_func, plot=False, return_='pred', append=False, init='external',
             init_method=init,
             lengthscale_prior=[GammaPrior(1.2,1.1), 0.2],
             noise_prior=None,
-            batch_size=random.sample([1,2,3,4,5,6,7,8,9,10],1)[0],
+            batch_size=batch_size,
             fast_comp=fast_comp)
     
     bo.run(append=append)
@@ -127,6 +130,9 @@ def test_BO_PI():
 def test_BO_UCB():
     assert BO_pred('UCB', return_='none')
 
+def test_BO_qEI():
+    assert BO_pred('qEI', return_='none', batch_size=random.sample([2,3,4,5,6,7,8,9,10],1)[0])
+
 def test_BO_rand():
     assert BO_pred('rand', return_='none')
 
@@ -99,6 +99,36 @@ def BO_pred(acq_func, plot=False, return_='pred', append=False, init='external',
     elif return_ == 'none':
         return True
 
+# Test replicate simulations
+
+def BO_repeat(acq_func, iterations=2, seeds=[4, 5, 7], batch_size=2):
+
+    # Experiment index
+    X = np.linspace(0,1,1000)
+    exindex = pd.DataFrame([[x, f(x)] for x in X], columns=['x', 'f(x)'])
+
+    # Instatiate BO class
+    bo = BO(exindex=exindex,
+            domain=exindex.drop('f(x)', axis=1),
+            acquisition_function=acq_func,
+            init_method='rand',
+            lengthscale_prior=[GammaPrior(1.2,1.1), 0.2],
+            noise_prior=None,
+            batch_size=batch_size)
+
+    out = bo.repeat(iterations=iterations, seeds=seeds)
+
+    # One column per seed
+    if list(out.columns.values) != ['seed ' + str(s) for s in seeds]:
+        return False
+
+    # Initial batch plus one batch per iteration for each replicate
+    if len(out) != (iterations + 1) * batch_size:
+        return False
+
+    # Results are cleared between replicates
+    return len(bo.obj.results) == 0
+
 ############################################################################## Tests
 
 # Test simulation with different acquisition functions
@@ -114,3 +144,8 @@ def test_BO_MeanMax():
 
 def test_BO_UCB_TS():
     assert BO_pred('UCB-TS', return_='simulate')
+
+# Test replicate simulations
+
+def test_BO_repeat():
+    assert BO_repeat('EI')